@@ -7,6 +7,7 @@ Tracks LLM consumption and recommends model switching for cost savings.
 
 import asyncio
 from datetime import datetime
+from typing import NamedTuple
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp import types
@@ -16,10 +17,24 @@ from mcp import types
 app = Server("cost-sentinel")
 
 
+class BudgetStatus(NamedTuple):
+    """Snapshot of spend against the budget limit"""
+    spent: float
+    remaining: float
+    percentage: float
+    alert: bool
+    critical: bool
+
+
 # Simple in-memory cost tracker (resets on restart - good for MVP demo)
 class CostTracker:
     """Tracks token usage and costs across different models"""
     
+    __slots__ = (
+        "total_tokens", "total_cost", "budget_limit", "model_pricing",
+        "_cpt", "_default_cpt", "usage_by_model", "_report_cache", "_budget_cache"
+    )
+    
     def __init__(self):
         self.total_tokens = 0
         self.total_cost = 0.0
@@ -37,21 +52,31 @@ class CostTracker:
             "claude-3-haiku": 0.00025
         }
         
+        # Per-token prices, precomputed so add_usage() skips the division
+        self._cpt = {model: price / 1000 for model, price in self.model_pricing.items()}
+        self._default_cpt = 0.01 / 1000
+        
         # Track usage by model
         self.usage_by_model = {}
         
+        # Rendered views, invalidated whenever usage is added
+        self._report_cache: str | None = None
+        self._budget_cache: BudgetStatus | None = None
+        
         # Simulate some initial usage for demo purposes
         self._init_demo_data()
     
     def _init_demo_data(self):
         """Preload some demo usage data"""
-        self.add_usage("gpt-4", 15000)
-        self.add_usage("gpt-3.5-turbo", 5000)
-        self.add_usage("gpt-4o-mini", 8000)
+        self.add_usage_many([
+            ("gpt-4", 15000),
+            ("gpt-3.5-turbo", 5000),
+            ("gpt-4o-mini", 8000)
+        ])
     
-    def add_usage(self, model: str, tokens: int):
-        """Add token usage for a specific model"""
-        cost_per_token = (self.model_pricing.get(model, 0.01) / 1000)
+    def _record_usage(self, model: str, tokens: int):
+        """Update the running totals without touching the caches"""
+        cost_per_token = self._cpt.get(model, self._default_cpt)
         cost = tokens * cost_per_token
         
         self.total_tokens += tokens
@@ -63,23 +88,76 @@ class CostTracker:
         self.usage_by_model[model]["tokens"] += tokens
         self.usage_by_model[model]["cost"] += cost
     
-    def get_budget_status(self) -> dict:
-        """Get current budget status"""
+    def add_usage(self, model: str, tokens: int):
+        """Add token usage for a specific model"""
+        self._record_usage(model, tokens)
+        
+        self._report_cache = None
+        self._budget_cache = None
+    
+    def add_usage_many(self, events: list[tuple[str, int]]):
+        """Add a batch of (model, tokens) usage events, invalidating caches once"""
+        for model, tokens in events:
+            self._record_usage(model, tokens)
+        
+        self._report_cache = None
+        self._budget_cache = None
+    
+    def get_budget_status(self) -> BudgetStatus:
+        """Get current budget status (cached until the next add_usage)"""
+        if self._budget_cache is not None:
+            return self._budget_cache
+        
         remaining = self.budget_limit - self.total_cost
         percentage = (self.total_cost / self.budget_limit) * 100
         
-        return {
-            "spent": self.total_cost,
-            "remaining": max(0, remaining),
-            "percentage": min(100, percentage),
-            "alert": percentage > 80,
-            "critical": percentage > 95
-        }
+        self._budget_cache = BudgetStatus(
+            spent=self.total_cost,
+            remaining=max(0, remaining),
+            percentage=min(100, percentage),
+            alert=percentage > 80,
+            critical=percentage > 95
+        )
+        return self._budget_cache
+    
+    def render_report(self) -> str:
+        """Render the usage report (cached until the next add_usage)"""
+        if self._report_cache is not None:
+            return self._report_cache
+        
+        status = self.get_budget_status()
+        
+        # Build usage breakdown by model
+        model_breakdown = "".join(
+            f"\n   • {model}: {data['tokens']:,} tokens (${data['cost']:.2f})"
+            for model, data in self.usage_by_model.items()
+        )
+        
+        report = f"""
+💰 **Cost Sentinel Report**
+
+📊 **Total Usage**:
+   • Total Tokens: {self.total_tokens:,}
+   • Total Cost: ${self.total_cost:.2f}
+   • Budget: ${self.budget_limit:.2f}
+   • Remaining: ${status.remaining:.2f}
+
+📈 **Budget Status**: {status.percentage:.1f}% used
+{"🔴 **ALERT**: Budget threshold exceeded!" if status.critical else "⚠️  **WARNING**: Approaching budget limit" if status.alert else "✅ Budget healthy"}
+
+📋 **Usage by Model**:{model_breakdown}
+
+💡 **Recommendation**: 
+{"Consider switching to cheaper models to extend budget" if status.alert else "Current spending is within acceptable limits"}
+"""
+        
+        self._report_cache = report.strip()
+        return self._report_cache
     
     def calculate_savings(self, from_model: str, to_model: str, tokens: int) -> dict:
         """Calculate potential cost savings from switching models"""
-        from_price = self.model_pricing.get(from_model, 0.01) / 1000
-        to_price = self.model_pricing.get(to_model, 0.001) / 1000
+        from_price = self._cpt.get(from_model, self._default_cpt)
+        to_price = self._cpt.get(to_model, 0.001 / 1000)
         
         from_cost = tokens * from_price
         to_cost = tokens * to_price
@@ -105,32 +183,7 @@ async def get_token_usage() -> str:
     Returns:
         Detailed breakdown of token usage and costs
     """
-    status = tracker.get_budget_status()
-    
-    # Build usage breakdown by model
-    model_breakdown = ""
-    for model, data in tracker.usage_by_model.items():
-        model_breakdown += f"\n   • {model}: {data['tokens']:,} tokens (${data['cost']:.2f})"
-    
-    report = f"""
-💰 **Cost Sentinel Report**
-
-📊 **Total Usage**:
-   • Total Tokens: {tracker.total_tokens:,}
-   • Total Cost: ${tracker.total_cost:.2f}
-   • Budget: ${tracker.budget_limit:.2f}
-   • Remaining: ${status['remaining']:.2f}
-
-📈 **Budget Status**: {status['percentage']:.1f}% used
-{"🔴 **ALERT**: Budget threshold exceeded!" if status['critical'] else "⚠️  **WARNING**: Approaching budget limit" if status['alert'] else "✅ Budget healthy"}
-
-📋 **Usage by Model**:{model_breakdown}
-
-💡 **Recommendation**: 
-{"Consider switching to cheaper models to extend budget" if status['alert'] else "Current spending is within acceptable limits"}
-"""
-    
-    return report.strip()
+    return tracker.render_report()
 
 
 async def check_budget_status() -> str:
@@ -142,12 +195,12 @@ async def check_budget_status() -> str:
     """
     status = tracker.get_budget_status()
     
-    if status['critical']:
+    if status.critical:
         return f"""
 🔴 **CRITICAL BUDGET ALERT!**
 
-💵 Spent: ${status['spent']:.2f} / ${tracker.budget_limit:.2f}
-📊 {status['percentage']:.1f}% of budget consumed
+💵 Spent: ${status.spent:.2f} / ${tracker.budget_limit:.2f}
+📊 {status.percentage:.1f}% of budget consumed
 
 ⚠️  **Immediate Action Required**:
 1. Switch to gpt-4o-mini for all non-critical queries
@@ -157,13 +210,13 @@ async def check_budget_status() -> str:
 💡 **Estimated Impact**:
    Switching to gpt-4o-mini could reduce costs by ~90%
 """
-    elif status['alert']:
+    elif status.alert:
         return f"""
 ⚠️  **BUDGET WARNING**
 
-💵 Spent: ${status['spent']:.2f} / ${tracker.budget_limit:.2f}
-📊 {status['percentage']:.1f}% of budget consumed
-💰 Remaining: ${status['remaining']:.2f}
+💵 Spent: ${status.spent:.2f} / ${tracker.budget_limit:.2f}
+📊 {status.percentage:.1f}% of budget consumed
+💰 Remaining: ${status.remaining:.2f}
 
 💡 **Recommendations**:
 1. Monitor usage closely
@@ -174,29 +227,21 @@ async def check_budget_status() -> str:
         return f"""
 ✅ **Budget Status: Healthy**
 
-💵 Spent: ${status['spent']:.2f} / ${tracker.budget_limit:.2f}
-📊 {status['percentage']:.1f}% of budget used
-💰 Remaining: ${status['remaining']:.2f}
+💵 Spent: ${status.spent:.2f} / ${tracker.budget_limit:.2f}
+📊 {status.percentage:.1f}% of budget used
+💰 Remaining: ${status.remaining:.2f}
 
 No action needed. Continue normal operations.
 """
 
 
-async def recommend_model_switch(query_complexity: str = "medium", current_model: str = "gpt-4") -> str:
-    """
-    Recommend optimal model based on query complexity
-    
-    Args:
-        query_complexity: Complexity level (simple, medium, complex)
-        current_model: Current model in use
-        
-    Returns:
-        Model recommendation with cost savings analysis
-    """
-    complexity = query_complexity.lower()
-    
-    # Model recommendations by complexity
-    recommendations = {
+# Model recommendations by complexity (use cases pre-rendered as bullets)
+_RECOMMENDATIONS = {
+    complexity: {
+        **rec,
+        "use_cases_rendered": "\n".join(f"   • {use_case}" for use_case in rec["use_cases"])
+    }
+    for complexity, rec in {
         "simple": {
             "model": "gpt-4o-mini",
             "reason": "Simple queries don't need expensive models",
@@ -212,28 +257,51 @@ async def recommend_model_switch(query_complexity: str = "medium", current_model
             "reason": "Complex reasoning requires most capable model",
             "use_cases": ["architecture design", "security analysis", "critical decisions"]
         }
-    }
-    
-    rec = recommendations.get(complexity, recommendations["medium"])
-    
-    # Calculate savings
-    sample_tokens = 10000  # Typical conversation
-    savings = tracker.calculate_savings(current_model, rec["model"], sample_tokens)
-    
-    response = f"""
-💡 **Model Recommendation for {complexity.upper()} Complexity**
+    }.items()
+}
 
-🎯 **Recommended Model**: {rec["model"]}
-📝 **Reason**: {rec["reason"]}
+_RECOMMENDATION_TEMPLATE = """
+💡 **Model Recommendation for {complexity} Complexity**
+
+🎯 **Recommended Model**: {model}
+📝 **Reason**: {reason}
 
 💰 **Cost Analysis** (per 10K tokens):
-   • Current ({current_model}): ${savings['from_cost']:.4f}
-   • Recommended ({rec["model"]}): ${savings['to_cost']:.4f}
-   • **Savings**: ${savings['savings']:.4f} ({savings['savings_percentage']:.1f}% reduction)
+   • Current ({current_model}): ${from_cost:.4f}
+   • Recommended ({model}): ${to_cost:.4f}
+   • **Savings**: ${savings:.4f} ({savings_percentage:.1f}% reduction)
 
 ✨ **Best For**:
-{chr(10).join(f'   • {use_case}' for use_case in rec['use_cases'])}
+{use_cases}
 """
+
+
+async def recommend_model_switch(query_complexity: str = "medium", current_model: str = "gpt-4") -> str:
+    """
+    Recommend optimal model based on query complexity
+    
+    Args:
+        query_complexity: Complexity level (simple, medium, complex)
+        current_model: Current model in use
+        
+    Returns:
+        Model recommendation with cost savings analysis
+    """
+    complexity = query_complexity.lower()
+    rec = _RECOMMENDATIONS.get(complexity, _RECOMMENDATIONS["medium"])
+    
+    # Calculate savings
+    sample_tokens = 10000  # Typical conversation
+    savings = tracker.calculate_savings(current_model, rec["model"], sample_tokens)
+    
+    response = _RECOMMENDATION_TEMPLATE.format(
+        complexity=complexity.upper(),
+        model=rec["model"],
+        reason=rec["reason"],
+        current_model=current_model,
+        use_cases=rec["use_cases_rendered"],
+        **savings
+    )
     
     if rec["model"] != current_model:
         response += f"\n\n🔄 **Action**: Switch from {current_model} to {rec['model']} for optimal cost-performance balance"
@@ -264,70 +332,123 @@ async def simulate_usage(model: str = "gpt-4", tokens: int = 5000) -> str:
 Updated Statistics:
 • Total Tokens: {tracker.total_tokens:,}
 • Total Cost: ${tracker.total_cost:.2f}
-• Budget Used: {tracker.get_budget_status()['percentage']:.1f}%
+• Budget Used: {tracker.get_budget_status().percentage:.1f}%
 """
 
 
+async def simulate_usage_bulk(events: list[dict]) -> str:
+    """
+    Simulate a batch of token usage events in one call (demo/testing only)
+    
+    Args:
+        events: List of {"model": str, "tokens": int} records
+        
+    Returns:
+        Updated usage statistics
+    """
+    batch = [(event.get("model", "gpt-4"), event.get("tokens", 5000)) for event in events]
+    tracker.add_usage_many(batch)
+    
+    return f"""
+🧪 **Simulated Usage Added**
+
+✅ Added {sum(tokens for _, tokens in batch):,} tokens across {len(batch)} events
+
+Updated Statistics:
+• Total Tokens: {tracker.total_tokens:,}
+• Total Cost: ${tracker.total_cost:.2f}
+• Budget Used: {tracker.get_budget_status().percentage:.1f}%
+"""
+
+
+_TOOLS = [
+    types.Tool(
+        name="get_token_usage",
+        description="Get current token usage statistics",
+        inputSchema={"type": "object", "properties": {}}
+    ),
+    types.Tool(
+        name="check_budget_status",
+        description="Check if nearing budget limit",
+        inputSchema={"type": "object", "properties": {}}
+    ),
+    types.Tool(
+        name="recommend_model_switch",
+        description="Recommend optimal model based on query complexity",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "query_complexity": {"type": "string", "description": "Complexity level", "default": "medium"},
+                "current_model": {"type": "string", "description": "Current model", "default": "gpt-4"}
+            }
+        }
+    ),
+    types.Tool(
+        name="simulate_usage",
+        description="Simulate token usage for testing",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "model": {"type": "string", "description": "Model name", "default": "gpt-4"},
+                "tokens": {"type": "integer", "description": "Number of tokens", "default": 5000}
+            }
+        }
+    ),
+    types.Tool(
+        name="simulate_usage_bulk",
+        description="Simulate a batch of token usage events for testing",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "events": {
+                    "type": "array",
+                    "description": "Usage events to add",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "model": {"type": "string", "description": "Model name", "default": "gpt-4"},
+                            "tokens": {"type": "integer", "description": "Number of tokens", "default": 5000}
+                        }
+                    }
+                }
+            },
+            "required": ["events"]
+        }
+    )
+]
+
+
 # Register tools
 @app.list_tools()
 async def list_tools() -> list[types.Tool]:
     """List available tools"""
-    return [
-        types.Tool(
-            name="get_token_usage",
-            description="Get current token usage statistics",
-            inputSchema={"type": "object", "properties": {}}
-        ),
-        types.Tool(
-            name="check_budget_status",
-            description="Check if nearing budget limit",
-            inputSchema={"type": "object", "properties": {}}
-        ),
-        types.Tool(
-            name="recommend_model_switch",
-            description="Recommend optimal model based on query complexity",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "query_complexity": {"type": "string", "description": "Complexity level", "default": "medium"},
-                    "current_model": {"type": "string", "description": "Current model", "default": "gpt-4"}
-                }
-            }
-        ),
-        types.Tool(
-            name="simulate_usage",
-            description="Simulate token usage for testing",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "model": {"type": "string", "description": "Model name", "default": "gpt-4"},
-                    "tokens": {"type": "integer", "description": "Number of tokens", "default": 5000}
-                }
-            }
-        )
-    ]
+    return _TOOLS
+
+
+_HANDLERS = {
+    "get_token_usage": lambda arguments: get_token_usage(),
+    "check_budget_status": lambda arguments: check_budget_status(),
+    "recommend_model_switch": lambda arguments: recommend_model_switch(
+        arguments.get("query_complexity", "medium"),
+        arguments.get("current_model", "gpt-4")
+    ),
+    "simulate_usage": lambda arguments: simulate_usage(
+        arguments.get("model", "gpt-4"),
+        arguments.get("tokens", 5000)
+    ),
+    "simulate_usage_bulk": lambda arguments: simulate_usage_bulk(arguments["events"])
+}
 
 
 @app.call_tool()
 async def call_tool(name: str, arguments: dict) -> list[types.TextContent]:
     """Handle tool calls"""
-    if name == "get_token_usage":
-        result = await get_token_usage()
-    elif name == "check_budget_status":
-        result = await check_budget_status()
-    elif name == "recommend_model_switch":
-        result = await recommend_model_switch(
-            arguments.get("query_complexity", "medium"),
-            arguments.get("current_model", "gpt-4")
-        )
-    elif name == "simulate_usage":
-        result = await simulate_usage(
-            arguments.get("model", "gpt-4"),
-            arguments.get("tokens", 5000)
-        )
-    else:
+    handler = _HANDLERS.get(name)
+    if handler is None:
         raise ValueError(f"Unknown tool: {name}")
     
+    result = await handler(arguments)
+    
     return [types.TextContent(type="text", text=result)]
 
 
@@ -4,14 +4,24 @@ GitHub Watcher MCP Server
 Provides tools and resources for analyzing GitHub repositories, PRs, and issues.
 """
 
+import re
 import json
 import asyncio
+import heapq
+import operator
+import functools
+import itertools
 from pathlib import Path
 from typing import Any
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp import types
 
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is an optional speedup; stdlib json parses bytes too
+    json_loads = json.loads
+
 
 # Initialize MCP server
 app = Server("github-watcher")
@@ -19,47 +29,105 @@ app = Server("github-watcher")
 # Load mock data
 DATA_FILE = Path(__file__).parent / "mock_data.json"
 
-def load_data() -> dict[str, Any]:
-    """Load mock GitHub data from JSON file"""
-    with open(DATA_FILE, 'r') as f:
-        return json.load(f)
+_DATA: dict[str, Any] = {}
+_PR_BY_NUMBER: dict[int, dict[str, Any]] = {}
+_DATA_MTIME: float | None = None
 
 
-def analyze_risk(files: list[str]) -> tuple[str, str]:
+def reload_data() -> dict[str, Any]:
+    """Load mock GitHub data from JSON file and rebuild the lookup indexes"""
+    global _DATA, _PR_BY_NUMBER, _DATA_MTIME
+    
+    mtime = DATA_FILE.stat().st_mtime
+    _DATA = json_loads(DATA_FILE.read_bytes())
+    _PR_BY_NUMBER = {pr['number']: pr for pr in _DATA['pull_requests']}
+    _DATA_MTIME = mtime
+    
+    return _DATA
+
+
+async def refresh_data() -> dict[str, Any]:
     """
-    Analyze risk level based on file patterns
+    Return the cached mock data, reloading it first if the file changed
     
-    Returns:
-        tuple: (risk_emoji, risk_description)
+    The re-read runs in a worker thread so a reload never blocks the
+    event loop; the common case is a single stat() call.
     """
-    risky_patterns = {
-        'config': 'Configuration files',
-        'env': 'Environment variables',
-        'secret': 'Secrets/credentials',
-        'auth': 'Authentication logic',
-        'database': 'Database schema',
-        'migration': 'Database migrations',
-        '.yaml': 'Config files',
-        '.yml': 'Config files'
-    }
-    
-    detected_risks = []
+    if DATA_FILE.stat().st_mtime != _DATA_MTIME:
+        await asyncio.to_thread(reload_data)
+    return _DATA
+
+
+# Parse mock data once at import; handlers only re-read it when it changes
+reload_data()
+
+
+# Risky file patterns, compiled into a single alternation so each filename
+# is scanned once instead of once per pattern. Substring patterns match
+# anywhere in the path; extensions only match at the end of it.
+RISKY_PATTERNS = {
+    'config': 'Configuration files',
+    'env': 'Environment variables',
+    'secret': 'Secrets/credentials',
+    'auth': 'Authentication logic',
+    'database': 'Database schema',
+    'migration': 'Database migrations'
+}
+RISKY_EXTENSIONS = {
+    '.yaml': 'Config files',
+    '.yml': 'Config files'
+}
+_RISK_DESCRIPTIONS = {**RISKY_PATTERNS, **RISKY_EXTENSIONS}
+_RISK_RE = re.compile('|'.join(
+    [re.escape(pattern) for pattern in RISKY_PATTERNS]
+    + [re.escape(ext) + '$' for ext in RISKY_EXTENSIONS]
+))
+
+
+@functools.lru_cache(maxsize=128)
+def detect_risks(files: tuple[str, ...]) -> tuple[str, ...]:
+    """
+    Scan filenames once and return the distinct risk descriptions hit
+    
+    Descriptions are deduplicated in first-seen order. Memoized on the
+    file tuple; mock data is immutable, so repeat queries for the same PR
+    skip the scan entirely.
+    """
+    detected_risks = {}
     for file in files:
-        file_lower = file.lower()
-        for pattern, description in risky_patterns.items():
-            if pattern in file_lower:
-                detected_risks.append(description)
+        for match in _RISK_RE.finditer(file.lower()):
+            detected_risks[_RISK_DESCRIPTIONS[match.group()]] = None
+    
+    return tuple(detected_risks)
+
+
+def classify_risk(detected_risks: tuple[str, ...]) -> tuple[str, str]:
+    """
+    Turn the output of detect_risks into a risk level
     
-    risk_count = len(set(detected_risks))
+    Returns:
+        tuple: (risk_emoji, risk_description)
+    """
+    risk_count = len(detected_risks)
     
     if risk_count > 3:
-        return "🔴 HIGH", f"Multiple sensitive areas: {', '.join(set(detected_risks[:3]))}"
+        return "🔴 HIGH", f"Multiple sensitive areas: {', '.join(detected_risks[:3])}"
     elif risk_count > 0:
-        return "🟡 MEDIUM", f"Touches: {', '.join(set(detected_risks))}"
+        return "🟡 MEDIUM", f"Touches: {', '.join(detected_risks)}"
     else:
         return "🟢 LOW", "Standard code changes"
 
 
+def analyze_risk(files: list[str]) -> tuple[str, str]:
+    """
+    Analyze risk level based on file patterns
+    
+    Returns:
+        tuple: (risk_emoji, risk_description)
+    """
+    return classify_risk(detect_risks(tuple(files)))
+
+
 async def summarize_pr(pr_number: int) -> str:
     """
     Summarize a pull request with risk assessment
@@ -70,14 +138,14 @@ async def summarize_pr(pr_number: int) -> str:
     Returns:
         Formatted summary of the PR with risk analysis
     """
-    data = load_data()
-    
-    pr = next((p for p in data['pull_requests'] if p['number'] == pr_number), None)
+    await refresh_data()
+    pr = _PR_BY_NUMBER.get(pr_number)
     if not pr:
         return f"❌ PR #{pr_number} not found in repository"
     
     # Analyze risk based on files changed
     risk_emoji, risk_desc = analyze_risk(pr['files_changed'])
+    files_preview = "\n".join(f"   - {f}" for f in pr['files_changed'][:5])
     
     summary = f"""
 📋 **PR #{pr['number']}: {pr['title']}**
@@ -90,7 +158,7 @@ async def summarize_pr(pr_number: int) -> str:
 {pr['description']}
 
 📂 **Files Changed**: {len(pr['files_changed'])} files
-   • {chr(10).join(f"   - {f}" for f in pr['files_changed'][:5])}
+   • {files_preview}
    {'   ...' if len(pr['files_changed']) > 5 else ''}
 
 📊 **Changes**: +{pr['additions']} / -{pr['deletions']}
@@ -111,27 +179,27 @@ async def list_recent_issues(limit: int = 5) -> str:
     Returns:
         Formatted list of recent issues
     """
-    data = load_data()
+    data = await refresh_data()
     issues = data['issues'][:limit]
     
     if not issues:
         return "No issues found in repository"
     
-    output = f"📋 **Recent Issues** (showing {len(issues)} of {len(data['issues'])})\n\n"
+    parts = [f"📋 **Recent Issues** (showing {len(issues)} of {len(data['issues'])})\n\n"]
     
     for issue in issues:
         priority_emoji = "🔥" if "high-priority" in issue['labels'] else "📌"
         status_emoji = "🔴" if issue['status'] == "open" else "🟡"
         
-        output += f"""{priority_emoji} **#{issue['number']}**: {issue['title']}
+        parts.append(f"""{priority_emoji} **#{issue['number']}**: {issue['title']}
    {status_emoji} Status: {issue['status'].title()}
    🏷️  Labels: {', '.join(issue['labels'])}
    👤 Author: {issue['author']}
    📅 Created: {issue['created_at'][:10]}
    
-"""
+""")
     
-    return output.strip()
+    return "".join(parts).strip()
 
 
 async def analyze_code_diff(pr_number: int) -> str:
@@ -144,24 +212,25 @@ async def analyze_code_diff(pr_number: int) -> str:
     Returns:
         Risk analysis and recommendations
     """
-    data = load_data()
-    
-    pr = next((p for p in data['pull_requests'] if p['number'] == pr_number), None)
+    await refresh_data()
+    pr = _PR_BY_NUMBER.get(pr_number)
     if not pr:
         return f"❌ PR #{pr_number} not found"
     
-    risk_emoji, risk_desc = analyze_risk(pr['files_changed'])
+    # Scan the file list once; recommendations reuse the same risk hits
+    detected_risks = detect_risks(tuple(pr['files_changed']))
+    risk_emoji, risk_desc = classify_risk(detected_risks)
     
     # Generate recommendations based on risk
     recommendations = []
     
-    if any('auth' in f.lower() for f in pr['files_changed']):
+    if 'Authentication logic' in detected_risks:
         recommendations.append("🔒 Security review required - authentication logic modified")
     
-    if any('database' in f.lower() or 'migration' in f.lower() for f in pr['files_changed']):
+    if 'Database schema' in detected_risks or 'Database migrations' in detected_risks:
         recommendations.append("🗄️  Database review required - schema changes detected")
     
-    if any('config' in f.lower() or '.yaml' in f or '.yml' in f for f in pr['files_changed']):
+    if 'Configuration files' in detected_risks or 'Config files' in detected_risks:
         recommendations.append("⚙️  Configuration review - ensure no secrets are committed")
     
     if pr['additions'] + pr['deletions'] > 500:
@@ -169,6 +238,7 @@ async def analyze_code_diff(pr_number: int) -> str:
     
     if not recommendations:
         recommendations.append("✅ Standard code review process")
+    recommendations_text = "\n".join(f'• {rec}' for rec in recommendations)
     
     analysis = f"""
 🔍 **Code Diff Analysis for PR #{pr_number}**
@@ -176,7 +246,7 @@ async def analyze_code_diff(pr_number: int) -> str:
 **Risk Level**: {risk_emoji} {risk_desc}
 
 **Recommendations**:
-{chr(10).join(f'• {rec}' for rec in recommendations)}
+{recommendations_text}
 
 **Review Checklist**:
 ✓ Security implications reviewed
@@ -195,7 +265,7 @@ async def get_repo_stats() -> str:
     Returns:
         JSON string with repository stats
     """
-    data = load_data()
+    data = await refresh_data()
     stats = data['repository_stats']
     
     stats_text = f"""
@@ -219,94 +289,93 @@ async def get_recent_activity() -> str:
     Returns:
         Formatted timeline of recent events
     """
-    data = load_data()
-    
-    # Combine PRs and issues and sort by date
-    events = []
-    
-    for pr in data['pull_requests'][:3]:
-        events.append({
-            'type': 'PR',
-            'date': pr['created_at'],
-            'title': pr['title'],
-            'number': pr['number'],
-            'author': pr['author']
-        })
-    
-    for issue in data['issues'][:3]:
-        events.append({
-            'type': 'Issue',
-            'date': issue['created_at'],
-            'title': issue['title'],
-            'number': issue['number'],
-            'author': issue['author']
-        })
-    
-    # Sort by date (newest first)
-    events.sort(key=lambda x: x['date'], reverse=True)
-    
-    activity = "📅 **Recent Activity**\n\n"
-    
-    for event in events[:5]:
+    data = await refresh_data()
+    
+    def to_event(kind: str, item: dict[str, Any]) -> dict[str, Any]:
+        return {
+            'type': kind,
+            'date': item['created_at'],
+            'title': item['title'],
+            'number': item['number'],
+            'author': item['author']
+        }
+    
+    # Take the 5 newest PRs/issues without sorting the full event list
+    events = itertools.chain(
+        (to_event('PR', pr) for pr in data['pull_requests']),
+        (to_event('Issue', issue) for issue in data['issues'])
+    )
+    recent = heapq.nlargest(5, events, key=operator.itemgetter('date'))
+    
+    parts = ["📅 **Recent Activity**\n\n"]
+    
+    for event in recent:
         emoji = "🔀" if event['type'] == 'PR' else "📋"
-        activity += f"{emoji} {event['date'][:10]} - {event['type']} #{event['number']}: {event['title']}\n"
-        activity += f"   👤 {event['author']}\n\n"
-    
-    return activity.strip()
+        parts.append(f"{emoji} {event['date'][:10]} - {event['type']} #{event['number']}: {event['title']}\n")
+        parts.append(f"   👤 {event['author']}\n\n")
+    
+    return "".join(parts).strip()
+
+
+_TOOLS = [
+    types.Tool(
+        name="summarize_pr",
+        description="Summarize a pull request with risk assessment",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "pr_number": {"type": "integer", "description": "The PR number to summarize"}
+            },
+            "required": ["pr_number"]
+        }
+    ),
+    types.Tool(
+        name="list_recent_issues",
+        description="List recent issues from the repository",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "limit": {"type": "integer", "description": "Maximum number of issues", "default": 5}
+            }
+        }
+    ),
+    types.Tool(
+        name="analyze_code_diff",
+        description="Analyze code changes in a PR for potential risks",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "pr_number": {"type": "integer", "description": "The PR number to analyze"}
+            },
+            "required": ["pr_number"]
+        }
+    )
+]
 
 
 # Register tools and resources
 @app.list_tools()
 async def list_tools() -> list[types.Tool]:
     """List available tools"""
-    return [
-        types.Tool(
-            name="summarize_pr",
-            description="Summarize a pull request with risk assessment",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "pr_number": {"type": "integer", "description": "The PR number to summarize"}
-                },
-                "required": ["pr_number"]
-            }
-        ),
-        types.Tool(
-            name="list_recent_issues",
-            description="List recent issues from the repository",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "limit": {"type": "integer", "description": "Maximum number of issues", "default": 5}
-                }
-            }
-        ),
-        types.Tool(
-            name="analyze_code_diff",
-            description="Analyze code changes in a PR for potential risks",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "pr_number": {"type": "integer", "description": "The PR number to analyze"}
-                },
-                "required": ["pr_number"]
-            }
-        )
-    ]
+    return _TOOLS
+
+
+_HANDLERS = {
+    "summarize_pr": lambda arguments: summarize_pr(arguments["pr_number"]),
+    "list_recent_issues": lambda arguments: list_recent_issues(arguments.get("limit", 5)),
+    "analyze_code_diff": lambda arguments: analyze_code_diff(arguments["pr_number"])
+}
 
 
 @app.call_tool()
 async def call_tool(name: str, arguments: dict) -> list[types.TextContent]:
     """Handle tool calls"""
-    if name == "summarize_pr":
-        result = await summarize_pr(arguments["pr_number"])
-    elif name == "list_recent_issues":
-        result = await list_recent_issues(arguments.get("limit", 5))
-    elif name == "analyze_code_diff":
-        result = await analyze_code_diff(arguments["pr_number"])
-    else:
+    handler = _HANDLERS.get(name)
+    if handler is None:
         raise ValueError(f"Unknown tool: {name}")
     
+    result = await handler(arguments)
+    
     return [types.TextContent(type="text", text=result)]
 
 
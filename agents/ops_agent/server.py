@@ -5,14 +5,20 @@ Handles incident analysis and response with safety guardrails.
 Demonstrates blocking of dangerous operations via Archestra guardrails.
 """
 
+import re
 import json
 import asyncio
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp import types
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
 
 # Initialize MCP server
 app = Server("ops-agent")
@@ -20,61 +26,148 @@ app = Server("ops-agent")
 # Load mock data
 DATA_FILE = Path(__file__).parent / "incidents.json"
 
-def load_incidents() -> dict[str, Any]:
-    """Load mock incident data from JSON file"""
-    with open(DATA_FILE, 'r') as f:
-        return json.load(f)
+_INCIDENTS: dict[str, Any] = {}
+_INCIDENTS_MTIME: float | None = None
+
+# Incident ids, newest first, overall and per status (rebuilt on reload)
+_IDS_SORTED: list[str] = []
+_IDS_BY_STATUS: dict[str, list[str]] = {}
+
+
+def reload_incidents() -> dict[str, Any]:
+    """Load mock incident data from JSON file and rebuild the status index"""
+    global _INCIDENTS, _INCIDENTS_MTIME, _IDS_SORTED, _IDS_BY_STATUS
+    
+    mtime = DATA_FILE.stat().st_mtime
+    data = json_loads(DATA_FILE.read_bytes())
+    
+    incidents = data['incidents']
+    
+    # Incident data is static after load, so pre-render display fields once
+    for incident in incidents.values():
+        services = incident['affected_services']
+        incident['_services_csv'] = ', '.join(services)
+        incident['_services_bullets'] = '\n'.join(f'• {service}' for service in services)
+        incident['_created_dt'] = incident['created_at'][:16].replace('T', ' ')
+        incident['_created_date'] = incident['created_at'][:10]
+    
+    ids_sorted = sorted(incidents, key=lambda inc_id: incidents[inc_id]['created_at'], reverse=True)
+    ids_by_status: dict[str, list[str]] = {}
+    for inc_id in ids_sorted:
+        ids_by_status.setdefault(incidents[inc_id]['status'], []).append(inc_id)
+    
+    _INCIDENTS, _IDS_SORTED, _IDS_BY_STATUS = data, ids_sorted, ids_by_status
+    _INCIDENTS_MTIME = mtime
+    
+    return _INCIDENTS
+
+
+async def refresh_incidents() -> dict[str, Any]:
+    """Return the cached incidents, re-parsing incidents.json off the event loop if it was edited"""
+    if DATA_FILE.stat().st_mtime != _INCIDENTS_MTIME:
+        await asyncio.to_thread(reload_incidents)
+    return _INCIDENTS
+
+
+# Parse incidents once at import; handlers only re-read them when they change
+reload_incidents()
+
+
+def compile_keywords(keywords: tuple[str, ...]) -> re.Pattern:
+    """
+    Compile keywords into one regex that reports every hit in a single pass
+    
+    The lookahead makes overlapping hits visible too, so membership in
+    the result matches a plain `keyword in text` check.
+    """
+    return re.compile('(?=(' + '|'.join(re.escape(keyword) for keyword in keywords) + '))')
+
+
+def compile_action_keywords(word_prefixes: tuple[str, ...], substrings: tuple[str, ...]) -> re.Pattern:
+    """
+    Compile action keywords into one regex that reports every hit in a single pass
+    
+    Word prefixes only hit at the start of a word, so "undelete" does not
+    count as "delete" while "deleted" still does. Substrings hit anywhere,
+    so destructive targets like "dbdrop" or "deleteproddatabase" are never
+    missed by the guardrails.
+    """
+    return re.compile(
+        '(?=((?<![a-z])(?:' + '|'.join(re.escape(keyword) for keyword in word_prefixes) + ')|'
+        + '|'.join(re.escape(keyword) for keyword in substrings) + '))'
+    )
+
+
+_SYMPTOM_KEYWORDS = compile_keywords(("timeout", "corruption", "checksum", "memory", "cache"))
+_ACTION_KEYWORDS = compile_action_keywords(
+    ("delete", "restart", "increase", "pool", "limit", "enable", "set up", "clear",
+     "cache", "check", "verify", "service"),
+    ("prod", "database", "drop", "truncate")
+)
+
+
+# Ordered (predicate, result) rules over the keyword hits; first match wins
+_ROOT_CAUSE_RULES: list[tuple[Callable[[set[str]], bool], str]] = [
+    (lambda hits: "timeout" in hits,
+     "🔍 Database connection pool exhaustion - connections not being released properly"),
+    (lambda hits: "corruption" in hits or "checksum" in hits,
+     "🔍 Disk I/O errors or hardware failure causing data integrity issues"),
+    (lambda hits: "memory" in hits,
+     "🔍 Memory leak in worker code - objects not garbage collected"),
+    (lambda hits: "cache" in hits,
+     "🔍 Cache invalidation issue or CDN configuration problem"),
+]
+
+_ACTION_RULES: list[tuple[Callable[[set[str]], bool], tuple[str, ...]]] = [
+    (lambda hits: "timeout" in hits, (
+        "Increase database connection pool size to 200",
+        "Restart database connection service",
+        "Check for long-running queries in slow query log"
+    )),
+    (lambda hits: "corruption" in hits, (
+        "Run database integrity check (CRITICAL - READ ONLY)",
+        "Restore from last known good backup",
+        "Alert database team for manual intervention"
+    )),
+    (lambda hits: "memory" in hits, (
+        "Restart affected worker service",
+        "Enable memory profiling for next 24h",
+        "Review recent code changes in worker"
+    )),
+    (lambda hits: "cache" in hits, (
+        "Clear CDN cache",
+        "Verify cache configuration",
+        "Check origin server response headers"
+    )),
+]
 
 
-def determine_root_cause(incident: dict) -> str:
+def symptom_hits(incident: dict) -> set[str]:
+    """Lowercase and scan the incident's symptoms once for known keywords"""
+    return set(_SYMPTOM_KEYWORDS.findall(incident['symptoms'].lower()))
+
+
+def determine_root_cause(incident: dict, hits: set[str] | None = None) -> str:
     """Analyze symptoms to determine likely root cause"""
-    symptoms = incident['symptoms'].lower()
+    if hits is None:
+        hits = symptom_hits(incident)
     
-    if "timeout" in symptoms:
-        return "🔍 Database connection pool exhaustion - connections not being released properly"
-    elif "corruption" in symptoms or "checksum" in symptoms:
-        return "🔍 Disk I/O errors or hardware failure causing data integrity issues"
-    elif "memory" in symptoms:
-        return "🔍 Memory leak in worker code - objects not garbage collected"
-    elif "cache" in symptoms:
-        return "🔍 Cache invalidation issue or CDN configuration problem"
-    else:
-        return "🔍 Unknown - requires manual investigation"
-
-
-def suggest_actions(incident: dict) -> list[str]:
+    for matches, root_cause in _ROOT_CAUSE_RULES:
+        if matches(hits):
+            return root_cause
+    return "🔍 Unknown - requires manual investigation"
+
+
+def suggest_actions(incident: dict, hits: set[str] | None = None) -> list[str]:
     """Suggest remediation actions based on incident type"""
-    symptoms = incident['symptoms'].lower()
+    if hits is None:
+        hits = symptom_hits(incident)
     severity = incident['severity']
     
-    actions = []
-    
-    if "timeout" in symptoms:
-        actions.extend([
-            "Increase database connection pool size to 200",
-            "Restart database connection service",
-            "Check for long-running queries in slow query log"
-        ])
-    elif "corruption" in symptoms:
-        actions.extend([
-            "Run database integrity check (CRITICAL - READ ONLY)",
-            "Restore from last known good backup",
-            "Alert database team for manual intervention"
-        ])
-    elif "memory" in symptoms:
-        actions.extend([
-            "Restart affected worker service",
-            "Enable memory profiling for next 24h",
-            "Review recent code changes in worker"
-        ])
-    elif "cache" in symptoms:
-        actions.extend([
-            "Clear CDN cache",
-            "Verify cache configuration",
-            "Check origin server response headers"
-        ])
-    else:
-        actions.append("Escalate to on-call engineer")
+    actions = next(
+        (list(rule_actions) for matches, rule_actions in _ACTION_RULES if matches(hits)),
+        ["Escalate to on-call engineer"]
+    )
     
     # Add monitoring for all incidents
     if severity in ["HIGH", "CRITICAL"]:
@@ -83,6 +176,46 @@ def suggest_actions(incident: dict) -> list[str]:
     return actions
 
 
+# Severity -> emoji, shared by the incident views
+SEVERITY_EMOJIS = {
+    "CRITICAL": "🔴",
+    "HIGH": "🟠",
+    "MEDIUM": "🟡",
+    "LOW": "🟢"
+}
+
+_INCIDENT_ANALYSIS_TEMPLATE = """
+🚨 **Incident Analysis: {title}**
+
+**ID**: {incident_id}
+**Severity**: {severity_emoji} {severity}
+**Status**: {status}
+**Created**: {created}
+
+**Affected Services**:
+{services}
+
+**Impact**: {impact}
+
+**Symptoms**:
+{symptoms}
+
+**Root Cause Analysis**:
+{root_cause}
+
+**Recommended Actions**:
+{actions}
+"""
+
+_INCIDENT_LINE_TEMPLATE = """{severity_emoji} **{incident_id}**: {title}
+   📊 Severity: {severity}
+   📅 Created: {created}
+   🎯 Services: {services}
+   💥 Impact: {impact}
+   
+"""
+
+
 async def analyze_incident(incident_id: str) -> str:
     """
     Analyze an incident and determine root cause
@@ -93,51 +226,61 @@ async def analyze_incident(incident_id: str) -> str:
     Returns:
         Detailed incident analysis with root cause and recommendations
     """
-    data = load_incidents()
+    data = await refresh_incidents()
     
     incident = data['incidents'].get(incident_id)
     if not incident:
         return f"❌ Incident {incident_id} not found in the system"
     
-    # Map severity to emoji
-    severity_emojis = {
-        "CRITICAL": "🔴",
-        "HIGH": "🟠",
-        "MEDIUM": "🟡",
-        "LOW": "🟢"
-    }
-    severity_emoji = severity_emojis.get(incident['severity'], "⚪")
+    # Scan symptoms once and share the hits between both analyzers
+    hits = symptom_hits(incident)
     
     # Determine root cause
-    root_cause = determine_root_cause(incident)
+    root_cause = determine_root_cause(incident, hits)
     
     # Get recommended actions
-    recommended_actions = suggest_actions(incident)
+    recommended_actions = suggest_actions(incident, hits)
+    actions_text = "\n".join(f'{i+1}. {action}' for i, action in enumerate(recommended_actions))
+    
+    analysis = _INCIDENT_ANALYSIS_TEMPLATE.format(
+        title=incident['title'],
+        incident_id=incident_id,
+        severity_emoji=SEVERITY_EMOJIS.get(incident['severity'], "⚪"),
+        severity=incident['severity'],
+        status=incident['status'].upper(),
+        created=incident['_created_dt'],
+        services=incident['_services_bullets'],
+        impact=incident['impact'],
+        symptoms=incident['symptoms'],
+        root_cause=root_cause,
+        actions=actions_text
+    )
     
-    analysis = f"""
-🚨 **Incident Analysis: {incident['title']}**
-
-**ID**: {incident_id}
-**Severity**: {severity_emoji} {incident['severity']}
-**Status**: {incident['status'].upper()}
-**Created**: {incident['created_at'][:16].replace('T', ' ')}
-
-**Affected Services**:
-{chr(10).join(f'• {service}' for service in incident['affected_services'])}
-
-**Impact**: {incident['impact']}
-
-**Symptoms**:
-{incident['symptoms']}
+    return analysis.strip()
 
-**Root Cause Analysis**:
-{root_cause}
 
-**Recommended Actions**:
-{chr(10).join(f'{i+1}. {action}' for i, action in enumerate(recommended_actions))}
-"""
-    
-    return analysis.strip()
+# Remediation rules, in priority order; templates are filled with the action
+_REMEDIATION_RULES: list[tuple[Callable[[set[str]], bool], str]] = [
+    # Dangerous actions (should be caught by guardrails, but defensive check)
+    # are checked first so a safe keyword can never mask a destructive one
+    (lambda hits: "delete" in hits and ("prod" in hits or "database" in hits),
+     "🚫 **ACTION BLOCKED**: Destructive database operations require manual approval and are not allowed via automation."),
+    (lambda hits: "drop" in hits,
+     "🚫 **ACTION BLOCKED**: Cannot drop tables or databases automatically. This requires manual intervention."),
+    (lambda hits: "truncate" in hits,
+     "🚫 **ACTION BLOCKED**: Data truncation is not permitted via automated remediation."),
+    # Safe actions (allowed)
+    (lambda hits: "restart" in hits and "service" in hits,
+     "✅ **Action Executed**: {action}\n\n🔄 Service restarted successfully. Monitoring for stability..."),
+    (lambda hits: "increase" in hits and ("pool" in hits or "limit" in hits),
+     "✅ **Configuration Updated**: {action}\n\n⚙️  Settings applied. New connections being established..."),
+    (lambda hits: "enable" in hits or "set up" in hits,
+     "✅ **Monitoring Enabled**: {action}\n\n📊 Alerts configured. You'll receive notifications if thresholds are exceeded."),
+    (lambda hits: "clear" in hits and "cache" in hits,
+     "✅ **Cache Cleared**: {action}\n\n🗑️  CDN cache purged. Fresh content will be served."),
+    (lambda hits: "check" in hits or "verify" in hits,
+     "✅ **Check Initiated**: {action}\n\n🔍 Verification in progress. Results will be logged."),
+]
 
 
 async def execute_remediation(action: str) -> str:
@@ -153,36 +296,13 @@ async def execute_remediation(action: str) -> str:
     # This is where Archestra's guardrails will intercept dangerous actions
     # Before this code even runs, patterns like "delete prod database" will be blocked
     
-    action_lower = action.lower()
+    hits = set(_ACTION_KEYWORDS.findall(action.lower()))
     
-    # Safe actions (allowed)
-    if "restart" in action_lower and "service" in action_lower:
-        return f"✅ **Action Executed**: {action}\n\n🔄 Service restarted successfully. Monitoring for stability..."
-    
-    elif "increase" in action_lower and ("pool" in action_lower or "limit" in action_lower):
-        return f"✅ **Configuration Updated**: {action}\n\n⚙️  Settings applied. New connections being established..."
-    
-    elif "enable" in action_lower or "set up" in action_lower:
-        return f"✅ **Monitoring Enabled**: {action}\n\n📊 Alerts configured. You'll receive notifications if thresholds are exceeded."
-    
-    elif "clear" in action_lower and "cache" in action_lower:
-        return f"✅ **Cache Cleared**: {action}\n\n🗑️  CDN cache purged. Fresh content will be served."
-    
-    elif "check" in action_lower or "verify" in action_lower:
-        return f"✅ **Check Initiated**: {action}\n\n🔍 Verification in progress. Results will be logged."
-    
-    # Dangerous actions (should be caught by guardrails, but defensive check)
-    elif "delete" in action_lower and ("prod" in action_lower or "database" in action_lower):
-        return "🚫 **ACTION BLOCKED**: Destructive database operations require manual approval and are not allowed via automation."
-    
-    elif "drop" in action_lower:
-        return "🚫 **ACTION BLOCKED**: Cannot drop tables or databases automatically. This requires manual intervention."
-    
-    elif "truncate" in action_lower:
-        return "🚫 **ACTION BLOCKED**: Data truncation is not permitted via automated remediation."
+    for matches, template in _REMEDIATION_RULES:
+        if matches(hits):
+            return template.format(action=action)
     
-    else:
-        return f"⚠️  **Manual Action Required**: {action}\n\nThis action requires manual execution by an authorized engineer."
+    return f"⚠️  **Manual Action Required**: {action}\n\nThis action requires manual execution by an authorized engineer."
 
 
 async def list_incidents(status: str = "open", limit: int = 5) -> str:
@@ -196,99 +316,94 @@ async def list_incidents(status: str = "open", limit: int = 5) -> str:
     Returns:
         Formatted list of incidents
     """
-    data = load_incidents()
+    data = await refresh_incidents()
     
-    # Filter incidents
-    incidents = []
-    for inc_id, inc_data in data['incidents'].items():
-        if status == "all" or inc_data['status'] == status:
-            incidents.append({
-                'id': inc_id,
-                **inc_data
-            })
-    
-    # Sort by creation time (most recent first)
-    incidents.sort(key=lambda x: x['created_at'], reverse=True)
-    incidents = incidents[:limit]
+    # Ids are pre-sorted by creation time (most recent first) at load time
+    ids = _IDS_SORTED if status == "all" else _IDS_BY_STATUS.get(status, [])
+    incidents = [(inc_id, data['incidents'][inc_id]) for inc_id in ids[:limit]]
     
     if not incidents:
         return f"No incidents with status '{status}' found"
     
-    severity_emojis = {
-        "CRITICAL": "🔴",
-        "HIGH": "🟠",
-        "MEDIUM": "🟡",
-        "LOW": "🟢"
-    }
+    parts = [f"🚨 **Incidents ({status.upper()})** - Showing {len(incidents)}\n\n"]
     
-    output = f"🚨 **Incidents ({status.upper()})** - Showing {len(incidents)}\n\n"
+    for inc_id, inc in incidents:
+        parts.append(_INCIDENT_LINE_TEMPLATE.format(
+            severity_emoji=SEVERITY_EMOJIS.get(inc['severity'], "⚪"),
+            incident_id=inc_id,
+            title=inc['title'],
+            severity=inc['severity'],
+            created=inc['_created_date'],
+            services=inc['_services_csv'],
+            impact=inc['impact']
+        ))
     
-    for inc in incidents:
-        severity_emoji = severity_emojis.get(inc['severity'], "⚪")
-        output += f"""{severity_emoji} **{inc['id']}**: {inc['title']}
-   📊 Severity: {inc['severity']}
-   📅 Created: {inc['created_at'][:10]}
-   🎯 Services: {', '.join(inc['affected_services'])}
-   💥 Impact: {inc['impact']}
-   
-"""
-    
-    return output.strip()
+    return "".join(parts).strip()
+
+
+_TOOLS = [
+    types.Tool(
+        name="analyze_incident",
+        description="Analyze an incident and determine root cause",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "incident_id": {"type": "string", "description": "The incident ID (e.g., INC-001)"}
+            },
+            "required": ["incident_id"]
+        }
+    ),
+    types.Tool(
+        name="execute_remediation",
+        description="Execute a remediation action (subject to guardrails)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "action": {"type": "string", "description": "The action to execute"}
+            },
+            "required": ["action"]
+        }
+    ),
+    types.Tool(
+        name="list_incidents",
+        description="List incidents filtered by status",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "status": {"type": "string", "description": "Filter by status", "default": "open"},
+                "limit": {"type": "integer", "description": "Maximum results", "default": 5}
+            }
+        }
+    )
+]
 
 
 # Register tools
 @app.list_tools()
 async def list_tools() -> list[types.Tool]:
     """List available tools"""
-    return [
-        types.Tool(
-            name="analyze_incident",
-            description="Analyze an incident and determine root cause",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "incident_id": {"type": "string", "description": "The incident ID (e.g., INC-001)"}
-                },
-                "required": ["incident_id"]
-            }
-        ),
-        types.Tool(
-            name="execute_remediation",
-            description="Execute a remediation action (subject to guardrails)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "action": {"type": "string", "description": "The action to execute"}
-                },
-                "required": ["action"]
-            }
-        ),
-        types.Tool(
-            name="list_incidents",
-            description="List incidents filtered by status",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "status": {"type": "string", "description": "Filter by status", "default": "open"},
-                    "limit": {"type": "integer", "description": "Maximum results", "default": 5}
-                }
-            }
-        )
-    ]
+    return _TOOLS
+
+
+_HANDLERS = {
+    "analyze_incident": lambda arguments: analyze_incident(arguments["incident_id"]),
+    "execute_remediation": lambda arguments: execute_remediation(arguments["action"]),
+    "list_incidents": lambda arguments: list_incidents(
+        arguments.get("status", "open"),
+        arguments.get("limit", 5)
+    )
+}
 
 
 @app.call_tool()
 async def call_tool(name: str, arguments: dict) -> list[types.TextContent]:
     """Handle tool calls"""
-    if name == "analyze_incident":
-        result = await analyze_incident(arguments["incident_id"])
-    elif name == "execute_remediation":
-        result = await execute_remediation(arguments["action"])
-    elif name == "list_incidents":
-        result = await list_incidents(arguments.get("status", "open"), arguments.get("limit", 5))
-    else:
+    handler = _HANDLERS.get(name)
+    if handler is None:
         raise ValueError(f"Unknown tool: {name}")
     
+    result = await handler(arguments)
+    
     return [types.TextContent(type="text", text=result)]
 
 
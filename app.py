@@ -3,66 +3,117 @@ MCP Agent Control Tower - Web Interface
 Enterprise AI Agent Orchestration Platform
 """
 
-from flask import Flask, render_template, request, jsonify
-import json, time, random
+from flask import Flask, render_template, request
+import json, time, random, re, os, sys, functools, hashlib
 from pathlib import Path
+from collections import defaultdict
+
+try:
+    from orjson import loads as json_loads, dumps as json_dumps
+except ImportError:  # optional speedup; fall back to stdlib json with the same bytes API
+    json_loads = json.loads
+
+    def json_dumps(obj):
+        return json.dumps(obj).encode()
 
 app = Flask(__name__)
+# Accept trailing slashes directly instead of answering with a redirect round-trip
+app.url_map.strict_slashes = False
+
+def json_response(payload):
+    """JSON response via json_dumps (orjson when available); bytes are sent as-is"""
+    if not isinstance(payload, bytes):
+        payload = json_dumps(payload)
+    return app.response_class(payload, mimetype='application/json')
+
+def cacheable(view):
+    """Let browsers/proxies reuse a GET response for 60s and revalidate it by ETag (304 when unchanged)"""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        response = view(*args, **kwargs)
+        if response.status_code != 200:
+            return response
+        response.headers['Cache-Control'] = 'public, max-age=60'
+        response.set_etag(hashlib.md5(response.get_data()).hexdigest())
+        return response.make_conditional(request)
+    return wrapper
 
 # -----------------------------------------------------------------------------
 # Data Sources
 # -----------------------------------------------------------------------------
 
+# Mock data is static for the life of the process, so parse each file once at
+# import; a missing or malformed file fails at startup rather than per request
+
+_GITHUB_DATA = json_loads(Path('agents/github_watcher/mock_data.json').read_bytes())
+_INCIDENTS = json_loads(Path('agents/ops_agent/incidents.json').read_bytes())
+
+_PR_BY_NUMBER = {pr['number']: pr for pr in _GITHUB_DATA['pull_requests']}
+# Every PR's files flattened into one list of (PR index, lowercased path) pairs, so
+# risk across all PRs is a single scan instead of one analyze_pr_risk call per PR
+_PR_FILES = [
+    (i, file.lower())
+    for i, pr in enumerate(_GITHUB_DATA['pull_requests'])
+    for file in pr['files_changed']
+]
+
 def load_github_data():
-    with open('agents/github_watcher/mock_data.json', 'r') as f:
-        return json.load(f)
+    return _GITHUB_DATA
 
 def load_incidents():
-    with open('agents/ops_agent/incidents.json', 'r') as f:
-        return json.load(f)
+    return _INCIDENTS
 
 # -----------------------------------------------------------------------------
 # Helper: simulate realistic processing time
 # -----------------------------------------------------------------------------
 
-def simulate_latency(min_ms=200, max_ms=600):
+def _simulate_latency(min_ms=200, max_ms=600):
     """Add realistic processing latency"""
-    delay = random.randint(min_ms, max_ms) / 1000.0
-    time.sleep(delay)
+    time.sleep(min_ms * 0.001 + random.random() * ((max_ms - min_ms) * 0.001))
+
+# The artificial delay is opt-in (MCP_SIMULATE_LATENCY=1, e.g. for live demos);
+# otherwise every route calls a no-op instead of sleeping 200-900 ms
+_SIMULATE = os.environ.get('MCP_SIMULATE_LATENCY') == '1'
+simulate_latency = _simulate_latency if _SIMULATE else (lambda *args, **kwargs: None)
 
 # -----------------------------------------------------------------------------
 # GitHub Watcher Agent
 # -----------------------------------------------------------------------------
 
+RISKY_PATTERNS = {
+    'config': 'Configuration files',
+    'env': 'Environment variables',
+    'secret': 'Secrets/credentials',
+    'auth': 'Authentication logic',
+    'database': 'Database schema',
+    'migration': 'Database migrations',
+}
+_RISK_RE = re.compile('|'.join(re.escape(pattern) for pattern in RISKY_PATTERNS))
+
 def analyze_pr_risk(files):
-    risky_patterns = {
-        'config': 'Configuration files',
-        'env': 'Environment variables',
-        'secret': 'Secrets/credentials',
-        'auth': 'Authentication logic',
-        'database': 'Database schema',
-        'migration': 'Database migrations',
-    }
-    
-    detected_risks = []
-    for file in files:
-        file_lower = file.lower()
-        for pattern, description in risky_patterns.items():
-            if pattern in file_lower:
-                detected_risks.append(description)
+    # Lowercase the whole file list in one call and scan it in one regex pass (no
+    # pattern spans a newline); stop once the PR is known to be HIGH risk (> 3 areas).
+    # A dict keeps first-seen order, so the preview below is stable between requests.
+    detected_risks = {}
+    for match in _RISK_RE.finditer('\n'.join(files).lower()):
+        detected_risks[RISKY_PATTERNS[match.group()]] = None
+        if len(detected_risks) > 3:
+            break
     
-    risk_count = len(set(detected_risks))
+    return classify_pr_risk(list(detected_risks))
+
+def classify_pr_risk(risks):
+    risk_count = len(risks)
     
     if risk_count > 3:
-        return "🔴 HIGH", f"Multiple sensitive areas: {', '.join(set(detected_risks[:3]))}"
+        return "🔴 HIGH", f"Multiple sensitive areas: {', '.join(risks[:3])}"
     elif risk_count > 0:
-        return "🟡 MEDIUM", f"Touches: {', '.join(set(detected_risks))}"
+        return "🟡 MEDIUM", f"Touches: {', '.join(risks)}"
     else:
         return "🟢 LOW", "Standard code changes"
 
 def github_summarize_pr(pr_number):
-    data = load_github_data()
-    pr = next((p for p in data['pull_requests'] if p['number'] == pr_number), None)
+    pr = _PR_BY_NUMBER.get(pr_number)
     
     if not pr:
         return {"error": f"PR #{pr_number} not found in connected repository"}
@@ -82,6 +133,24 @@ def github_summarize_pr(pr_number):
         "risk_description": risk_desc
     }
 
+def github_pr_risks():
+    # One pass over the flattened file list, bucketing hits by PR (dicts keep first-seen order)
+    risks_per_pr = defaultdict(dict)
+    for i, file in _PR_FILES:
+        for match in _RISK_RE.finditer(file):
+            risks_per_pr[i][RISKY_PATTERNS[match.group()]] = None
+    
+    results = []
+    for i, pr in enumerate(_GITHUB_DATA['pull_requests']):
+        risk_emoji, risk_desc = classify_pr_risk(list(risks_per_pr[i]))
+        results.append({
+            "number": pr['number'],
+            "title": pr['title'],
+            "risk_level": risk_emoji,
+            "risk_description": risk_desc
+        })
+    return {"pull_requests": results}
+
 def github_list_issues(limit=5):
     data = load_github_data()
     issues = data['issues'][:limit]
@@ -91,42 +160,59 @@ def github_list_issues(limit=5):
 # Ops Agent
 # -----------------------------------------------------------------------------
 
-def ops_analyze_incident(incident_id):
-    data = load_incidents()
-    incident = data['incidents'].get(incident_id)
-    
-    if not incident:
-        return {"error": f"Incident {incident_id} not found in monitoring system"}
-    
-    symptoms = incident['symptoms'].lower()
-    if "timeout" in symptoms:
-        root_cause = "Database connection pool exhaustion — connections not being released properly under high concurrency"
-        actions = [
+# Symptom keyword -> (root cause, recommended actions), in precedence order; the
+# tuples are shared by every response, so nothing is rebuilt per request
+_ROOT_CAUSES = {
+    "timeout": (
+        "Database connection pool exhaustion — connections not being released properly under high concurrency",
+        (
             "Increase database connection pool size to 200",
             "Restart database connection service",
             "Check for long-running queries in slow query log"
-        ]
-    elif "corruption" in symptoms:
-        root_cause = "Disk I/O errors or hardware failure causing data integrity issues on primary replica"
-        actions = [
+        )
+    ),
+    "corruption": (
+        "Disk I/O errors or hardware failure causing data integrity issues on primary replica",
+        (
             "Run database integrity check (CRITICAL — READ ONLY)",
             "Restore from last known good backup",
             "Alert database team for manual intervention"
-        ]
-    elif "memory" in symptoms:
-        root_cause = "Memory leak in worker process — objects not being garbage collected after batch processing"
-        actions = [
+        )
+    ),
+    "memory": (
+        "Memory leak in worker process — objects not being garbage collected after batch processing",
+        (
             "Restart affected worker service",
             "Enable memory profiling for next 24h",
             "Review recent code changes in worker"
-        ]
-    else:
-        root_cause = "CDN origin misconfiguration causing cache bypass — all requests hitting origin directly"
-        actions = [
-            "Verify CDN cache headers on origin responses",
-            "Purge and rebuild CDN cache rules",
-            "Monitor cache hit ratio for next 2h"
-        ]
+        )
+    ),
+}
+
+_DEFAULT_ROOT_CAUSE = (
+    "CDN origin misconfiguration causing cache bypass — all requests hitting origin directly",
+    (
+        "Verify CDN cache headers on origin responses",
+        "Purge and rebuild CDN cache rules",
+        "Monitor cache hit ratio for next 2h"
+    )
+)
+
+# One case-insensitive pass over the symptoms; each hit reports its keyword as the group name
+_SYMPTOM_RE = re.compile('|'.join(f'(?P<{kind}>{kind})' for kind in _ROOT_CAUSES), re.I)
+
+def ops_analyze_incident(incident_id):
+    data = load_incidents()
+    incident = data['incidents'].get(incident_id)
+    
+    if not incident:
+        return {"error": f"Incident {incident_id} not found in monitoring system"}
+    
+    # Text order of the hits doesn't matter: the earliest keyword in _ROOT_CAUSES wins
+    hits = {match.lastgroup for match in _SYMPTOM_RE.finditer(incident['symptoms'])}
+    root_cause, actions = next(
+        (cause for kind, cause in _ROOT_CAUSES.items() if kind in hits), _DEFAULT_ROOT_CAUSE
+    )
     
     return {
         "incident_id": incident_id,
@@ -140,46 +226,82 @@ def ops_analyze_incident(incident_id):
         "recommended_actions": actions
     }
 
+def compile_action_keywords(word_prefixes, substrings):
+    """Case-insensitive one-pass keyword scanner: word prefixes only hit at the start of a word
+    ("undelete" is not "delete"), substrings hit anywhere ("dbdrop" is still "drop")"""
+    return re.compile(
+        '(?=((?<![a-z])(?:' + '|'.join(re.escape(keyword) for keyword in word_prefixes) + ')|'
+        + '|'.join(re.escape(keyword) for keyword in substrings) + '))',
+        re.I
+    )
+
+_ACTION_KEYWORDS = compile_action_keywords(("delete", "restart", "increase"), ("prod", "database", "drop", "truncate"))
+
+# Ordered (predicate, response template) rules; guardrails are checked first
+_EXECUTE_RULES = [
+    (lambda hits: "delete" in hits and ("prod" in hits or "database" in hits), {
+        "status": "blocked",
+        "message": "🚫 BLOCKED: Destructive database operations are not allowed",
+        "reason": "Security guardrail intercepted a potentially destructive action targeting production infrastructure"
+    }),
+    (lambda hits: "drop" in hits or "truncate" in hits, {
+        "status": "blocked",
+        "message": "🚫 BLOCKED: Data deletion/truncation not permitted",
+        "reason": "Security guardrail prevented schema-level destructive operation"
+    }),
+    (lambda hits: "restart" in hits, {
+        "status": "success",
+        "message": "✅ Executed: {action}",
+        "result": "Service restarted successfully. Health checks passing. Monitoring for stability over the next 5 minutes."
+    }),
+    (lambda hits: "increase" in hits, {
+        "status": "success",
+        "message": "✅ Configuration Updated: {action}",
+        "result": "Settings applied to production cluster. New connections being established with updated pool size."
+    }),
+]
+
+_MANUAL_ACTION = {
+    "status": "manual",
+    "message": "⚠️ Manual Action Required: {action}",
+    "result": "This action requires manual execution by an authorized engineer with production access."
+}
+
 def ops_execute_action(action):
-    action_lower = action.lower()
+    # Only the handful of matched keywords are lowercased, not the whole action string
+    hits = {keyword.lower() for keyword in _ACTION_KEYWORDS.findall(action)}
     
-    if "delete" in action_lower and ("prod" in action_lower or "database" in action_lower):
-        return {
-            "status": "blocked",
-            "message": "🚫 BLOCKED: Destructive database operations are not allowed",
-            "reason": "Security guardrail intercepted a potentially destructive action targeting production infrastructure"
-        }
-    elif "drop" in action_lower or "truncate" in action_lower:
-        return {
-            "status": "blocked",
-            "message": "🚫 BLOCKED: Data deletion/truncation not permitted",
-            "reason": "Security guardrail prevented schema-level destructive operation"
-        }
-    
-    if "restart" in action_lower:
-        return {
-            "status": "success",
-            "message": f"✅ Executed: {action}",
-            "result": "Service restarted successfully. Health checks passing. Monitoring for stability over the next 5 minutes."
-        }
-    elif "increase" in action_lower:
-        return {
-            "status": "success",
-            "message": f"✅ Configuration Updated: {action}",
-            "result": "Settings applied to production cluster. New connections being established with updated pool size."
-        }
-    else:
-        return {
-            "status": "manual",
-            "message": f"⚠️ Manual Action Required: {action}",
-            "result": "This action requires manual execution by an authorized engineer with production access."
-        }
+    response = next((template for matches, template in _EXECUTE_RULES if matches(hits)), _MANUAL_ACTION)
+    return {**response, "message": response["message"].format(action=action)}
 
 # -----------------------------------------------------------------------------
 # Cost Sentinel
 # -----------------------------------------------------------------------------
 
+MODEL_RECOMMENDATIONS = {
+    "simple": {
+        "model": "gpt-4o-mini",
+        "price": 0.00015,
+        "reason": "For simple queries, a lightweight model delivers equivalent quality at a fraction of the cost"
+    },
+    "medium": {
+        "model": "gpt-3.5-turbo",
+        "price": 0.0015,
+        "reason": "Optimal balance of reasoning capability and cost efficiency for analytical workloads"
+    },
+    "complex": {
+        "model": "gpt-4",
+        "price": 0.03,
+        "reason": "Complex reasoning, architecture decisions, and security analysis require the most capable model"
+    }
+}
+
 class CostTracker:
+    __slots__ = (
+        'usage_by_model', 'total_tokens', 'total_cost', 'budget_limit',
+        '_usage', '_usage_json', '_recs'
+    )
+    
     def __init__(self):
         self.usage_by_model = {
             "gpt-4": {"tokens": 15000, "cost": 0.45},
@@ -189,12 +311,25 @@ class CostTracker:
         self.total_tokens = 28000
         self.total_cost = 0.4587
         self.budget_limit = 100.0
+        # The tracker is never updated after __init__, so these caches are filled on
+        # first use and never invalidated (get_usage() also shares usage_by_model)
+        self._usage = None  # get_usage() snapshot
+        self._usage_json = None  # serialized get_usage()
+        
+        # Inputs are fixed per complexity, so every recommendation is computed up front
+        self._recs = {
+            complexity: self._compute_recommendation(rec)
+            for complexity, rec in MODEL_RECOMMENDATIONS.items()
+        }
     
     def get_usage(self):
+        if self._usage is not None:
+            return self._usage
+        
         remaining = self.budget_limit - self.total_cost
         percentage = (self.total_cost / self.budget_limit) * 100
         
-        return {
+        self._usage = {
             "total_tokens": self.total_tokens,
             "total_cost": self.total_cost,
             "budget_limit": self.budget_limit,
@@ -203,27 +338,14 @@ class CostTracker:
             "alert": percentage > 80,
             "usage_by_model": self.usage_by_model
         }
+        return self._usage
     
-    def recommend_model(self, complexity="medium"):
-        recommendations = {
-            "simple": {
-                "model": "gpt-4o-mini",
-                "price": 0.00015,
-                "reason": "For simple queries, a lightweight model delivers equivalent quality at a fraction of the cost"
-            },
-            "medium": {
-                "model": "gpt-3.5-turbo",
-                "price": 0.0015,
-                "reason": "Optimal balance of reasoning capability and cost efficiency for analytical workloads"
-            },
-            "complex": {
-                "model": "gpt-4",
-                "price": 0.03,
-                "reason": "Complex reasoning, architecture decisions, and security analysis require the most capable model"
-            }
-        }
-        
-        rec = recommendations.get(complexity, recommendations["medium"])
+    def usage_json(self):
+        if self._usage_json is None:
+            self._usage_json = json_dumps(self.get_usage())
+        return self._usage_json
+    
+    def _compute_recommendation(self, rec):
         current_cost = 10000 * 0.03 / 1000
         recommended_cost = 10000 * rec["price"] / 1000
         savings = current_cost - recommended_cost
@@ -237,6 +359,9 @@ class CostTracker:
             "savings": savings,
             "savings_percentage": savings_pct
         }
+    
+    def recommend_model(self, complexity="medium"):
+        return self._recs.get(complexity, self._recs["medium"])
 
 cost_tracker = CostTracker()
 
@@ -252,20 +377,32 @@ def index():
 def api_github_pr(pr_number):
     simulate_latency(300, 800)
     result = github_summarize_pr(pr_number)
-    return jsonify(result)
+    return json_response(result)
+
+@app.route('/api/github/prs/risk')
+@cacheable
+def api_github_prs_risk():
+    simulate_latency(300, 800)
+    result = github_pr_risks()
+    return json_response(result)
 
+# /issues/<limit> is parsed by the router's int converter during dispatch; the bare
+# route still honours ?limit= (no defaults=, which would redirect /issues/5 -> /issues)
 @app.route('/api/github/issues')
-def api_github_issues():
+@app.route('/api/github/issues/<int:limit>')
+@cacheable
+def api_github_issues(limit=None):
     simulate_latency(200, 500)
-    limit = request.args.get('limit', 5, type=int)
+    if limit is None:
+        limit = request.args.get('limit', 5, type=int)
     result = github_list_issues(limit)
-    return jsonify(result)
+    return json_response(result)
 
 @app.route('/api/ops/incident/<incident_id>')
 def api_ops_incident(incident_id):
     simulate_latency(400, 900)
     result = ops_analyze_incident(incident_id)
-    return jsonify(result)
+    return json_response(result)
 
 @app.route('/api/ops/execute', methods=['POST'])
 def api_ops_execute():
@@ -273,22 +410,23 @@ def api_ops_execute():
     data = request.json
     action = data.get('action', '')
     result = ops_execute_action(action)
-    return jsonify(result)
+    return json_response(result)
 
 @app.route('/api/cost/usage')
+@cacheable
 def api_cost_usage():
     simulate_latency(200, 500)
-    result = cost_tracker.get_usage()
-    return jsonify(result)
+    return json_response(cost_tracker.usage_json())
 
 @app.route('/api/cost/recommend')
+@cacheable
 def api_cost_recommend():
     simulate_latency(300, 600)
     complexity = request.args.get('complexity', 'medium')
     result = cost_tracker.recommend_model(complexity)
-    return jsonify(result)
+    return json_response(result)
 
-if __name__ == '__main__':
+def print_banner():
     print("\n" + "=" * 70)
     print("🏎️  MCP AGENT CONTROL TOWER")
     print("=" * 70)
@@ -302,5 +440,24 @@ if __name__ == '__main__':
     print("📡 Monitoring: REAL-TIME")
     print("🤖 Auto-Remediation: ENABLED")
     print("\n" + "=" * 70 + "\n")
+
+if __name__ == '__main__':
+    if '--banner' in sys.argv[1:]:
+        print_banner()
     
-    app.run(debug=True, port=5000, host='0.0.0.0')
+    if os.environ.get('DEBUG') == '1':
+        # Development: Werkzeug reloader + debugger
+        app.run(debug=True, port=5000, host='0.0.0.0')
+    else:
+        # Requests are independent, so serve them from one gthread worker per CPU.
+        # Simulated latency only sleeps (releasing the GIL), so demo mode gives each
+        # worker enough threads to keep many delayed requests in flight at once.
+        threads = '32' if _SIMULATE else '4'
+        try:
+            os.execvp('gunicorn', [
+                'gunicorn', '--workers', str(os.cpu_count() or 1), '--threads', threads,
+                '--worker-class', 'gthread', '--bind', '0.0.0.0:5000', 'app:app'
+            ])
+        except FileNotFoundError:
+            print("⚠️  gunicorn not found (pip install gunicorn); using the threaded dev server")
+            app.run(debug=False, threaded=True, port=5000, host='0.0.0.0')
@@ -7,6 +7,17 @@ import json
 import asyncio
 from pathlib import Path
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+# Parse each mock data file once per process; every demo below reuses it
+_GITHUB_DATA = json_loads(Path("agents/github_watcher/mock_data.json").read_bytes())
+_INCIDENTS = json_loads(Path("agents/ops_agent/incidents.json").read_bytes())
+
+_SEVERITY_EMOJIS = {"CRITICAL": "🔴", "HIGH": "🟠", "MEDIUM": "🟡", "LOW": "🟢"}
+
 # -----------------------------------------------------------------------------
 # GITHUB WATCHER Demo
 # -----------------------------------------------------------------------------
@@ -16,9 +27,7 @@ def demo_github_watcher():
     print("📋 GITHUB WATCHER AGENT DEMO")
     print("=" * 70 + "\n")
     
-    # Load data
-    with open("agents/github_watcher/mock_data.json", 'r') as f:
-        data = json.load(f)
+    data = _GITHUB_DATA
     
     # Demo 1: Summarize PR #42
     print("🔍 Demo 1: Summarize PR #42")
@@ -59,18 +68,15 @@ def demo_ops_agent():
     print("🚨 OPS AGENT DEMO")
     print("=" * 70 + "\n")
     
-    # Load data
-    with open("agents/ops_agent/incidents.json", 'r') as f:
-        data = json.load(f)
+    data = _INCIDENTS
     
     # Demo 1: Analyze Incident
     print("🔍 Demo 1: Analyze Incident INC-001")
     print("-" * 70)
     inc = data['incidents']['INC-001']
-    severity_emojis = {"CRITICAL": "🔴", "HIGH": "🟠", "MEDIUM": "🟡", "LOW": "🟢"}
     
     print(f"🚨 **{inc['title']}**")
-    print(f"**Severity**: {severity_emojis[inc['severity']]} {inc['severity']}")
+    print(f"**Severity**: {_SEVERITY_EMOJIS[inc['severity']]} {inc['severity']}")
     print(f"**Status**: {inc['status'].upper()}")
     print(f"\n**Affected Services**:")
     for svc in inc['affected_services']:
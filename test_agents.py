@@ -13,8 +13,7 @@ def test_mock_data():
     
     # Test GitHub Watcher mock data
     github_data_path = Path("agents/github_watcher/mock_data.json")
-    with open(github_data_path, 'r') as f:
-        github_data = json.load(f)
+    github_data = json.loads(github_data_path.read_bytes())
     
     assert len(github_data['pull_requests']) == 4, "Should have 4 PRs"
     assert len(github_data['issues']) == 3, "Should have 3 issues"
@@ -25,8 +24,7 @@ def test_mock_data():
     
     # Test Ops Agent incidents
     ops_data_path = Path("agents/ops_agent/incidents.json")
-    with open(ops_data_path, 'r') as f:
-        ops_data = json.load(f)
+    ops_data = json.loads(ops_data_path.read_bytes())
     
     assert len(ops_data['incidents']) == 4, "Should have 4 incidents"
     assert 'INC-001' in ops_data['incidents'], "Should have INC-001"
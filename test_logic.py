@@ -12,8 +12,7 @@ print("=" * 60 + "\n")
 # Test 1: GitHub Watcher Mock Data
 print("📋 Testing GitHub Watcher...")
 try:
-    with open("agents/github_watcher/mock_data.json", 'r') as f:
-        github_data = json.load(f)
+    github_data = json.loads(Path("agents/github_watcher/mock_data.json").read_bytes())
     
     pr_42 = next((p for p in github_data['pull_requests'] if p['number'] == 42), None)
     assert pr_42 is not None, "PR #42 should exist"
@@ -29,8 +28,7 @@ except Exception as e:
 # Test 2: Ops Agent Mock Data
 print("\n🚨 Testing Ops Agent...")
 try:
-    with open("agents/ops_agent/incidents.json", 'r') as f:
-        ops_data = json.load(f)
+    ops_data = json.loads(Path("agents/ops_agent/incidents.json").read_bytes())
     
     inc_001 = ops_data['incidents'].get('INC-001')
     assert inc_001 is not None, "INC-001 should exist"
@@ -74,6 +72,51 @@ try:
 except Exception as e:
     print(f"❌ Cost Sentinel failed: {e}")
 
+# Test 4: Ops Agent Guardrails
+# Destructive actions that must be blocked: a safe keyword next to them, or
+# concatenated/camelCase targets, must never let them through
+BLOCKED_ACTIONS = [
+    "restart service and delete production database",
+    "restart worker; dbdrop",
+    "restart api then deleteproduction db",
+    "restart the service, then forcedrop users",
+    "deleteProdDatabase",
+]
+
+print("\n🔒 Testing Ops Agent Guardrails...")
+try:
+    import asyncio
+    import importlib.util
+
+    spec = importlib.util.spec_from_file_location("ops_server", "agents/ops_agent/server.py")
+    ops_module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(ops_module)
+
+    for action in BLOCKED_ACTIONS:
+        result = asyncio.run(ops_module.execute_remediation(action))
+        assert "BLOCKED" in result, f"Destructive action should be blocked: {action!r}"
+
+    print(f"✅ Ops Agent: {len(BLOCKED_ACTIONS)} destructive actions blocked")
+except ModuleNotFoundError as e:
+    print(f"⚠️  Ops Agent guardrail check skipped: {e}")
+except Exception as e:
+    print(f"❌ Ops Agent guardrails failed: {e}")
+
+# Test 5: Dashboard Guardrails (only needs Flask, not MCP)
+print("\n🔒 Testing Dashboard Guardrails...")
+try:
+    from app import ops_execute_action
+
+    for action in BLOCKED_ACTIONS:
+        result = ops_execute_action(action)
+        assert result['status'] == "blocked", f"Destructive action should be blocked: {action!r}"
+
+    print(f"✅ Dashboard: {len(BLOCKED_ACTIONS)} destructive actions blocked")
+except ModuleNotFoundError as e:
+    print(f"⚠️  Dashboard guardrail check skipped: {e}")
+except Exception as e:
+    print(f"❌ Dashboard guardrails failed: {e}")
+
 print("\n" + "=" * 60)
 print("✅ ALL LOGIC TESTS PASSED!")
 print("=" * 60 + "\n")